@@ -1,23 +1,60 @@
-import os
 import sys
+import asyncio
 import argparse
 from datetime import datetime
 
-# Add the utils directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils"))
-
 # Import ETL components
-from extract import scrape_main
-from transform import transform_data
-from load import load_data
+from utils.extract import iter_pages, save_raw_pages
+from utils.transform import transform_data, combine_chunks
+from utils.load import load_data, write_products_csv
+
+async def extract_and_transform(max_pages=50, use_cache=True, debug=False):
+    """
+    Scrape the pages and transform each one as soon as it arrives, so the
+    full raw data is never held in memory next to the transformed data
+
+    Args:
+        max_pages (int): Maximum number of pages to scrape
+        use_cache (bool): Reuse cached pages from previous runs
+        debug (bool): Also save the raw data to raw_products.csv
+
+    Returns:
+        tuple: Number of raw rows scraped and the transformed DataFrame
+            (None if nothing was scraped or a page failed to transform)
+    """
+    raw_rows = 0
+    chunks = []
+
+    pages = iter_pages(max_pages=max_pages, use_cache=use_cache)
+    # Save raw data for debugging, one page at a time
+    if debug:
+        pages = save_raw_pages(pages, "raw_products.csv")
+
+    async for raw_page in pages:
+        raw_rows += len(raw_page)
+
+        transformed_page = transform_data(raw_page)
+        if transformed_page is None:
+            return raw_rows, None
+        chunks.append(transformed_page)
+
+    if not chunks:
+        return raw_rows, None
+    return raw_rows, combine_chunks(chunks)
 
-def run_etl_pipeline(max_pages=50, output_csv="products.csv"):
+def run_etl_pipeline(max_pages=50, output_csv="products.csv", use_cache=True, debug=False,
+                     google_sheet_id=None, postgresql_conn_string=None, output_format="csv"):
     """
     Run the complete ETL pipeline
 
     Args:
         max_pages (int): Maximum number of pages to scrape
         output_csv (str): Path to save the CSV file
+        use_cache (bool): Reuse cached pages from previous runs
+        debug (bool): Also save the raw and transformed data to CSV files
+        google_sheet_id (str, optional): Google Sheets ID
+        postgresql_conn_string (str, optional): PostgreSQL connection string
+        output_format (str): Format of the output file, "csv" or "parquet"
 
     Returns:
         bool: True if successful, False otherwise
@@ -26,44 +63,54 @@ def run_etl_pipeline(max_pages=50, output_csv="products.csv"):
     print(f"=== ETL Pipeline started at {start_time} ===")
 
     try:
-        # Extract data
-        print("\n=== EXTRACT PHASE ===")
-        raw_data = scrape_main(max_pages=max_pages)
-        if raw_data is None or raw_data.empty:
+        # Extract and transform data page by page
+        print("\n=== EXTRACT & TRANSFORM PHASE ===")
+        raw_rows, transformed_data = asyncio.run(
+            extract_and_transform(max_pages=max_pages, use_cache=use_cache, debug=debug)
+        )
+        if raw_rows == 0:
             print("Error: No data extracted. Pipeline terminated.")
             return False
 
-        # Save raw data for debugging
-        raw_data.to_csv("raw_products.csv", index=False)
-        print(f"Raw data saved to raw_products.csv. Shape: {raw_data.shape}")
+        print(f"Total products scraped: {raw_rows}")
+        if debug:
+            print("Raw data saved to raw_products.csv")
 
-        # Transform data
-        print("\n=== TRANSFORM PHASE ===")
-        transformed_data = transform_data(raw_data)
-        if transformed_data.empty:
+        if transformed_data is None or transformed_data.empty:
             print("Error: Data transformation failed. Pipeline terminated.")
             return False
 
         # Save transformed data for debugging
-        transformed_data.to_csv("transformed_products.csv", index=False)
-        print(f"Transformed data saved to transformed_products.csv. Shape: {transformed_data.shape}")
+        if debug:
+            write_products_csv(transformed_data, "transformed_products.csv")
+            print(f"Transformed data saved to transformed_products.csv. Shape: {transformed_data.shape}")
 
         # Load data
         print("\n=== LOAD PHASE ===")
-        result = load_data(transformed_data, output_csv_path=output_csv)
+        result = load_data(
+            transformed_data,
+            output_csv_path=output_csv,
+            google_sheet_id=google_sheet_id,
+            postgresql_conn_string=postgresql_conn_string,
+            output_format=output_format
+        )
 
         # Print result
         print("\n=== LOAD RESULTS ===")
-        if result["csv"]:
-            print("CSV: Success")
-        else:
-            print("CSV: Failed")
+        file_label = "Parquet" if output_format == "parquet" else "CSV"
+        for name, label in [("csv", file_label), ("google_sheets", "Google Sheets"), ("postgresql", "PostgreSQL")]:
+            if result[name] is None:
+                print(f"{label}: Skipped")
+            elif result[name]:
+                print(f"{label}: Success")
+            else:
+                print(f"{label}: Failed")
 
         end_time = datetime.now()
         duration = end_time - start_time
         print(f"\n=== ETL Pipeline completed at {end_time} (Duration: {duration}) ===")
 
-        return result["csv"]
+        return all(status is not False for status in result.values())
 
     except Exception as e:
         print(f"Error in ETL pipeline: {str(e)}")
@@ -76,13 +123,23 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Fashion Studio ETL Pipeline")
     parser.add_argument("--max-pages", type=int, default=50, help="Maximum number of pages to scrape")
     parser.add_argument("--output-csv", type=str, default="products.csv", help="Path to save the CSV file")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="Format of the output file")
+    parser.add_argument("--no-cache", action="store_true", help="Always fetch pages from the website instead of the local cache")
+    parser.add_argument("--debug", action="store_true", help="Save intermediate raw and transformed data to CSV files")
+    parser.add_argument("--google-sheet-id", type=str, default=None, help="Google Sheets ID to also load the data into")
+    parser.add_argument("--postgresql-conn-string", type=str, default=None, help="PostgreSQL connection string to also load the data into")
 
     args = parser.parse_args()
 
     # Run the ETL pipeline
     success = run_etl_pipeline(
         max_pages=args.max_pages,
-        output_csv=args.output_csv
+        output_csv=args.output_csv,
+        use_cache=not args.no_cache,
+        debug=args.debug,
+        google_sheet_id=args.google_sheet_id,
+        postgresql_conn_string=args.postgresql_conn_string,
+        output_format=args.format
     )
 
     # Exit with appropriate status code
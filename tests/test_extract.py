@@ -0,0 +1,501 @@
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
+
+from utils.extract import (
+    CACHE_TTL,
+    MAX_RETRIES,
+    REQUEST_DELAY_INITIAL,
+    REQUEST_DELAY_MAX,
+    REQUEST_DELAY_MIN,
+    REQUEST_DELAY_STEP,
+    AdaptiveDelay,
+    fetch_html,
+    get_cache_path,
+    get_cache_ttl,
+    get_page_url,
+    get_page_url_template,
+    iter_pages,
+    load_cached_page,
+    report_page_error,
+    save_cached_page,
+    save_raw_pages,
+    scrape_page_from_tree,
+)
+
+BASE_URL = "https://fashion-studio.example"
+
+
+def make_page(titles, next_href=None):
+    """Build the HTML of a listing page with one product card per title"""
+    cards = "".join(
+        '<div class="collection-card"><div class="product-details">'
+        f'<h3 class="product-title">{title}</h3>'
+        '<div class="price-container"><span class="price">$100.00</span></div>'
+        '<p>Rating: ⭐ 4.5 / 5</p><p>3 Colors</p><p>Size: M</p><p>Gender: Men</p>'
+        '</div></div>'
+        for title in titles
+    )
+    pagination = f'<a class="page-link" href="{next_href}">Next</a>' if next_href else ""
+    return f'<html><body>{cards}<ul class="pagination">{pagination}</ul></body></html>'
+
+
+def make_site(page_count, url_for_page=lambda page: f"{BASE_URL}/page{page}"):
+    """Build a fake site with two products per page, keyed by page URL"""
+    pages = {}
+    for page in range(1, page_count + 1):
+        url = BASE_URL if page == 1 else url_for_page(page)
+        next_href = url_for_page(page + 1) if page < page_count else None
+        pages[url] = make_page([f"Product {page}-{index}" for index in range(2)], next_href)
+    return pages
+
+
+def serve(pages):
+    """Build a fetch_html replacement answering from a fake site, 404 for unknown URLs"""
+    requested = []
+
+    async def fetch_html(session, url, use_cache=True, semaphore=None, delay=None):
+        requested.append(url)
+        if url not in pages:
+            raise aiohttp.ClientResponseError(
+                request_info=mock.Mock(real_url=url), history=(), status=404, message="Not Found"
+            )
+        return pages[url]
+
+    return fetch_html, requested
+
+
+def scrape(pages, max_pages):
+    """Run iter_pages against a fake site and return the pages and printed output"""
+    fetch_html, requested = serve(pages)
+
+    async def collect():
+        return [page async for page in iter_pages(BASE_URL, max_pages, use_cache=False)]
+
+    output = io.StringIO()
+    with mock.patch("utils.extract.fetch_html", fetch_html), contextlib.redirect_stdout(output):
+        scraped = asyncio.run(collect())
+    return scraped, output.getvalue(), requested
+
+
+class TestCacheTtl(unittest.TestCase):
+    def test_missing_header_uses_default_ttl(self):
+        self.assertEqual(get_cache_ttl(None), CACHE_TTL)
+        self.assertEqual(get_cache_ttl(""), CACHE_TTL)
+
+    def test_no_store_and_no_cache_disable_caching(self):
+        self.assertEqual(get_cache_ttl("no-store"), 0)
+        self.assertEqual(get_cache_ttl("no-cache"), 0)
+        self.assertEqual(get_cache_ttl("private, No-Cache, max-age=600"), 0)
+
+    def test_max_age(self):
+        self.assertEqual(get_cache_ttl("max-age=0"), 0)
+        self.assertEqual(get_cache_ttl("public, Max-Age=120"), 120)
+
+    def test_max_age_is_capped_at_default_ttl(self):
+        self.assertEqual(get_cache_ttl(f"max-age={CACHE_TTL * 10}"), CACHE_TTL)
+
+    def test_bad_max_age_uses_default_ttl(self):
+        self.assertEqual(get_cache_ttl("max-age=soon"), CACHE_TTL)
+        self.assertEqual(get_cache_ttl("max-age="), CACHE_TTL)
+
+
+class TestPageCache(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+
+        patcher = mock.patch("utils.extract.CACHE_DIR", os.path.join(temp_dir.name, "cache"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_round_trip(self):
+        save_cached_page(BASE_URL, "<html>page 1</html>", 60)
+
+        self.assertEqual(load_cached_page(BASE_URL), "<html>page 1</html>")
+        self.assertIsNone(load_cached_page(f"{BASE_URL}/page2"))
+
+    def test_zero_ttl_is_not_cached(self):
+        save_cached_page(BASE_URL, "<html>page 1</html>", 0)
+
+        self.assertFalse(os.path.exists(get_cache_path(BASE_URL)))
+        self.assertIsNone(load_cached_page(BASE_URL))
+
+    def test_expired_entry_is_ignored(self):
+        save_cached_page(BASE_URL, "<html>page 1</html>", 60)
+
+        with mock.patch("utils.extract.time.time", return_value=time.time() + 61):
+            self.assertIsNone(load_cached_page(BASE_URL))
+
+    def test_corrupt_entry_is_ignored(self):
+        save_cached_page(BASE_URL, "<html>page 1</html>", 60)
+        with open(get_cache_path(BASE_URL), "w", encoding="utf-8") as f:
+            f.write("{not json")
+
+        self.assertIsNone(load_cached_page(BASE_URL))
+
+
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response"""
+
+    def __init__(self, status, body=""):
+        self.status = status
+        self.body = body
+        self.headers = {}
+
+    async def text(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(request_info=mock.Mock(), history=(), status=self.status)
+
+
+class FakeRequest:
+    """Async context manager returned by FakeSession.get"""
+
+    def __init__(self, outcome):
+        self.outcome = outcome
+
+    async def __aenter__(self):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """Session answering each request with the next outcome: a status code or an exception"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = 0
+
+    def get(self, url):
+        self.requests += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, int):
+            outcome = FakeResponse(outcome, f"<html>{url}</html>")
+        return FakeRequest(outcome)
+
+
+class TestAdaptiveDelay(unittest.TestCase):
+    def test_starts_at_initial_delay(self):
+        self.assertEqual(AdaptiveDelay().delay, REQUEST_DELAY_INITIAL)
+
+    def test_success_lowers_delay_down_to_minimum(self):
+        delay = AdaptiveDelay(REQUEST_DELAY_MIN + REQUEST_DELAY_STEP * 1.5)
+
+        delay.success()
+        self.assertAlmostEqual(delay.delay, REQUEST_DELAY_MIN + REQUEST_DELAY_STEP * 0.5)
+        delay.success()
+        self.assertEqual(delay.delay, REQUEST_DELAY_MIN)
+        delay.success()
+        self.assertEqual(delay.delay, REQUEST_DELAY_MIN)
+
+    def test_backoff_doubles_delay_up_to_maximum(self):
+        delay = AdaptiveDelay(REQUEST_DELAY_MAX / 3)
+
+        delay.backoff()
+        self.assertAlmostEqual(delay.delay, REQUEST_DELAY_MAX * 2 / 3)
+        delay.backoff()
+        self.assertEqual(delay.delay, REQUEST_DELAY_MAX)
+
+    def test_wait_adds_jitter_to_delay(self):
+        with mock.patch("utils.extract.random.uniform", return_value=0.05), \
+                mock.patch("utils.extract.asyncio.sleep", new_callable=mock.AsyncMock) as sleep:
+            asyncio.run(AdaptiveDelay(0.5).wait())
+
+        sleep.assert_awaited_once_with(0.55)
+
+
+class TestFetchHtml(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("utils.extract.RETRY_BACKOFF_FACTOR", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.delay = mock.Mock(spec=AdaptiveDelay)
+
+    def fetch(self, session):
+        return asyncio.run(fetch_html(session, BASE_URL, use_cache=False, delay=self.delay))
+
+    def test_success(self):
+        session = FakeSession(200)
+
+        self.assertEqual(self.fetch(session), f"<html>{BASE_URL}</html>")
+        self.assertEqual(session.requests, 1)
+        self.delay.wait.assert_awaited_once()
+        self.delay.success.assert_called_once()
+        self.delay.backoff.assert_not_called()
+
+    def test_retryable_statuses_back_off_and_retry(self):
+        session = FakeSession(429, 503, 200)
+
+        self.assertEqual(self.fetch(session), f"<html>{BASE_URL}</html>")
+        self.assertEqual(session.requests, 3)
+        self.assertEqual(self.delay.backoff.call_count, 2)
+        self.delay.success.assert_called_once()
+
+    def test_gives_up_after_max_retries(self):
+        session = FakeSession(*[503] * (MAX_RETRIES + 1))
+
+        with self.assertRaises(aiohttp.ClientResponseError) as context:
+            self.fetch(session)
+
+        self.assertEqual(context.exception.status, 503)
+        self.assertEqual(session.requests, MAX_RETRIES + 1)
+        self.assertEqual(self.delay.backoff.call_count, MAX_RETRIES + 1)
+        self.delay.success.assert_not_called()
+
+    def test_client_errors_are_not_retried(self):
+        session = FakeSession(404, 200)
+
+        with self.assertRaises(aiohttp.ClientResponseError) as context:
+            self.fetch(session)
+
+        self.assertEqual(context.exception.status, 404)
+        self.assertEqual(session.requests, 1)
+        self.delay.backoff.assert_not_called()
+
+    def test_dropped_connections_and_timeouts_are_retried(self):
+        for error in (aiohttp.ServerDisconnectedError(), asyncio.TimeoutError()):
+            with self.subTest(error=type(error).__name__):
+                self.delay.reset_mock()
+                session = FakeSession(error, 200)
+
+                self.assertEqual(self.fetch(session), f"<html>{BASE_URL}</html>")
+                self.assertEqual(session.requests, 2)
+                self.delay.backoff.assert_called_once()
+                self.delay.success.assert_called_once()
+
+    def test_persistent_timeout_is_raised(self):
+        session = FakeSession(*[asyncio.TimeoutError()] * (MAX_RETRIES + 1))
+
+        with self.assertRaises(asyncio.TimeoutError):
+            self.fetch(session)
+        self.assertEqual(session.requests, MAX_RETRIES + 1)
+
+    def test_timeout_is_reported_as_fetch_error(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            report_page_error(3, asyncio.TimeoutError())
+
+        self.assertEqual(output.getvalue(), "Error fetching page 3: request timed out\n")
+
+
+class TestIterPages(unittest.TestCase):
+    def test_scrapes_every_page_in_order(self):
+        scraped, _, _ = scrape(make_site(3), max_pages=3)
+
+        self.assertEqual(
+            [title for page in scraped for title in page["Title"]],
+            [f"Product {page}-{index}" for page in range(1, 4) for index in range(2)],
+        )
+
+    def test_max_pages_limits_the_pages_requested(self):
+        scraped, _, requested = scrape(make_site(5), max_pages=2)
+
+        self.assertEqual(len(scraped), 2)
+        self.assertEqual(requested, [BASE_URL, f"{BASE_URL}/page2"])
+
+    def test_no_pages_are_scraped_without_a_page_budget(self):
+        for max_pages in (0, -1):
+            with self.subTest(max_pages=max_pages):
+                scraped, _, requested = scrape(make_site(3), max_pages=max_pages)
+
+                self.assertEqual(scraped, [])
+                self.assertEqual(requested, [])
+
+    def test_missing_page_past_the_last_ends_quietly(self):
+        scraped, output, _ = scrape(make_site(12), max_pages=20)
+
+        self.assertEqual(len(scraped), 12)
+        self.assertIn("No more pages after page 12. Stopping.", output)
+        self.assertNotIn("Error", output)
+
+    def test_other_http_errors_are_reported(self):
+        pages = make_site(3)
+        fetch_html, _ = serve(pages)
+
+        async def failing_fetch_html(session, url, **kwargs):
+            if url.endswith("/page3"):
+                raise aiohttp.ClientResponseError(
+                    request_info=mock.Mock(real_url=url), history=(), status=500, message="Server Error"
+                )
+            return await fetch_html(session, url, **kwargs)
+
+        async def collect():
+            return [page async for page in iter_pages(BASE_URL, 3, use_cache=False)]
+
+        output = io.StringIO()
+        with mock.patch("utils.extract.fetch_html", failing_fetch_html), contextlib.redirect_stdout(output):
+            scraped = asyncio.run(collect())
+
+        self.assertEqual(len(scraped), 2)
+        self.assertIn("Error fetching page 3", output.getvalue())
+
+
+class TestSaveRawPages(unittest.TestCase):
+    def test_writes_one_header_and_passes_pages_through(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        output_path = os.path.join(temp_dir.name, "raw_products.csv")
+        fetch_html, _ = serve(make_site(3))
+
+        async def collect():
+            pages = save_raw_pages(iter_pages(BASE_URL, 3, use_cache=False), output_path)
+            return [page async for page in pages]
+
+        with mock.patch("utils.extract.fetch_html", fetch_html), contextlib.redirect_stdout(io.StringIO()):
+            scraped = asyncio.run(collect())
+
+        self.assertEqual(len(scraped), 3)
+        with open(output_path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], '"Title","Price","Rating","Colors","Size","Gender","timestamp"')
+        self.assertEqual(len(lines), 1 + 6)
+        self.assertTrue(lines[1].startswith('"Product 1-0","$100.00",'))
+
+
+class TestPageUrlTemplate(unittest.TestCase):
+    def test_path_page_number(self):
+        template = get_page_url_template(f"{BASE_URL}/page2")
+
+        self.assertEqual(template, (f"{BASE_URL}/page", ""))
+        self.assertEqual(get_page_url(BASE_URL, 7, template), f"{BASE_URL}/page7")
+
+    def test_query_page_number(self):
+        template = get_page_url_template(f"{BASE_URL}/products?page=2")
+
+        self.assertEqual(template, (f"{BASE_URL}/products?page=", ""))
+        self.assertEqual(get_page_url(BASE_URL, 12, template), f"{BASE_URL}/products?page=12")
+
+    def test_first_page_is_the_base_url(self):
+        template = get_page_url_template(f"{BASE_URL}/page2")
+
+        self.assertEqual(get_page_url(BASE_URL, 1, template), BASE_URL)
+
+    def test_other_numbers_in_the_url_are_ambiguous(self):
+        self.assertIsNone(get_page_url_template(f"{BASE_URL}/products?page=2&x=12"))
+
+    def test_url_without_the_page_number(self):
+        self.assertIsNone(get_page_url_template(f"{BASE_URL}/products?cursor=next"))
+
+
+class TestFollowNextLinks(unittest.TestCase):
+    @staticmethod
+    def url_for_page(page):
+        # The trailing number keeps the page number from being located in the URL
+        return f"{BASE_URL}/page{page}?ref=12"
+
+    def test_walks_next_links_in_order(self):
+        scraped, output, requested = scrape(make_site(4, self.url_for_page), max_pages=10)
+
+        self.assertEqual(requested, [BASE_URL] + [self.url_for_page(page) for page in range(2, 5)])
+        self.assertEqual([page["Title"].iloc[0] for page in scraped], [f"Product {page}-0" for page in range(1, 5)])
+        self.assertIn("No next page found. Stopping.", output)
+
+    def test_stops_at_max_pages(self):
+        scraped, _, requested = scrape(make_site(4, self.url_for_page), max_pages=3)
+
+        self.assertEqual(len(scraped), 3)
+        self.assertEqual(requested, [BASE_URL, self.url_for_page(2), self.url_for_page(3)])
+
+    def test_stops_at_empty_page(self):
+        pages = make_site(4, self.url_for_page)
+        pages[self.url_for_page(3)] = make_page([], self.url_for_page(4))
+
+        scraped, output, requested = scrape(pages, max_pages=10)
+
+        self.assertEqual(len(scraped), 2)
+        self.assertNotIn(self.url_for_page(4), requested)
+        self.assertIn("No products found on page 3. Stopping.", output)
+
+
+def scrape_card(details):
+    """Scrape a page holding a single product card with the given details HTML"""
+    html = f'<div class="collection-card"><div class="product-details">{details}</div></div>'
+    product = scrape_page_from_tree(LexborHTMLParser(html))
+    return {column: values[0] for column, values in product.items()}
+
+
+class TestScrapePageFromTree(unittest.TestCase):
+    def test_title_keeps_spaces_around_nested_markup(self):
+        product = scrape_card('<h3 class="product-title">Linen <b>Shirt</b></h3>')
+
+        self.assertEqual(product["Title"], "Linen Shirt")
+
+    def test_reads_every_field(self):
+        product = scrape_card(
+            '<h3 class="product-title">T-shirt 2</h3>'
+            '<div class="price-container"><span class="price">$102.15</span></div>'
+            '<p>Rating: ⭐ 3.9 / 5</p><p>3 Colors</p><p>Size: M</p><p>Gender: Women</p>'
+        )
+
+        self.assertEqual(product["Title"], "T-shirt 2")
+        self.assertEqual(product["Price"], "$102.15")
+        self.assertEqual(product["Rating"], "Rating: ⭐ 3.9 / 5")
+        self.assertEqual(product["Colors"], "3 Colors")
+        self.assertEqual(product["Size"], "Size: M")
+        self.assertEqual(product["Gender"], "Gender: Women")
+
+    def test_price_unavailable_anywhere_in_the_card(self):
+        product = scrape_card(
+            '<h3 class="product-title">T-shirt 2</h3>'
+            '<div class="price-container"><p class="price">Price Unavailable</p></div>'
+        )
+
+        self.assertEqual(product["Price"], "Price Unavailable")
+
+    def test_price_unavailable_must_be_the_element_own_text(self):
+        # The notice is only matched as the direct text of an element, not inside longer text
+        product = scrape_card('<div>Price Unavailable until <b>Monday</b></div><span>$20.00</span>')
+
+        self.assertEqual(product["Price"], "$20.00")
+
+    def test_missing_title_is_unknown_product(self):
+        product = scrape_card('<span class="price">$20.00</span>')
+
+        self.assertEqual(product["Title"], "Unknown Product")
+
+    def test_colors_paragraph_mentioning_rating_is_skipped(self):
+        product = scrape_card('<p>Rating: ⭐ 3.9 / 5 across 2 Colors</p><p>4 Colors</p>')
+
+        self.assertEqual(product["Rating"], "Rating: ⭐ 3.9 / 5 across 2 Colors")
+        self.assertEqual(product["Colors"], "4 Colors")
+
+    def test_missing_fields_stay_none(self):
+        product = scrape_card('<h3 class="product-title">T-shirt 2</h3><p>Size: M</p>')
+
+        self.assertIsNone(product["Price"])
+        self.assertIsNone(product["Rating"])
+        self.assertIsNone(product["Colors"])
+        self.assertIsNone(product["Gender"])
+
+    def test_first_matching_paragraph_wins(self):
+        product = scrape_card('<p>Size: M</p><p>Size: XL</p><p>Gender: Men</p><p>Gender: Women</p>')
+
+        self.assertEqual(product["Size"], "Size: M")
+        self.assertEqual(product["Gender"], "Gender: Men")
+
+    def test_products_share_the_page_timestamp(self):
+        card = '<div class="collection-card"><div class="product-details"><h3 class="product-title">{}</h3></div></div>'
+        product = scrape_page_from_tree(LexborHTMLParser(card.format("A") + card.format("B")))
+
+        self.assertEqual(product["Title"], ["A", "B"])
+        self.assertEqual(len(set(product["timestamp"])), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
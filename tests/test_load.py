@@ -0,0 +1,327 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+from googleapiclient.model import JsonModel
+
+from utils.load import (
+    GOOGLE_SHEETS_CHUNK_ROWS,
+    GOOGLE_WORKSHEET_ID,
+    POSTGRESQL_TABLE,
+    get_sheets_service,
+    load_data,
+    save_to_csv,
+    save_to_google_sheets,
+    save_to_postgresql,
+)
+
+
+def make_products():
+    """Build a small DataFrame shaped like the output of transform_data"""
+    df = pd.DataFrame({
+        "Title": ["T-shirt 2", "Hoodie 3"],
+        "Price": [1634400.0, 7950080.0],
+        "Rating": [3.9, 4.8],
+        "Colors": [3, 5],
+        "Size": ["M", "L"],
+        "Gender": ["Women", "Unisex"],
+        "timestamp": pd.to_datetime(["2025-05-13 21:58:00", "2025-05-13 21:58:00"]),
+    })
+    return df.astype({
+        "Price": "float32",
+        "Rating": "float32",
+        "Colors": "int16",
+        "Size": "category",
+        "Gender": "category",
+        "timestamp": "datetime64[s]",
+    })
+
+
+class TestSaveToCsv(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.output_path = os.path.join(temp_dir.name, "products.csv")
+
+    def test_writes_numbers_in_pandas_format(self):
+        self.assertTrue(save_to_csv(make_products(), self.output_path))
+
+        with open(self.output_path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), (
+                "Title,Price,Rating,Colors,Size,Gender,timestamp\n"
+                "T-shirt 2,1634400.0,3.9,3,M,Women,2025-05-13 21:58:00\n"
+                "Hoodie 3,7950080.0,4.8,5,L,Unisex,2025-05-13 21:58:00\n"
+            ))
+
+    def test_reads_back_with_the_same_numeric_types(self):
+        self.assertTrue(save_to_csv(make_products(), self.output_path))
+
+        df = pd.read_csv(self.output_path)
+        self.assertEqual(df["Price"].dtype, "float64")
+        self.assertEqual(df["Rating"].dtype, "float64")
+        self.assertEqual(df["Colors"].dtype, "int64")
+
+
+class TestSaveToParquet(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+
+    def test_writes_next_to_the_csv_path(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(save_to_csv(make_products(), os.path.join(self.temp_dir, "products.csv"), "parquet"))
+
+        self.assertEqual(os.listdir(self.temp_dir), ["products.parquet"])
+
+    def test_reads_back_with_the_same_types(self):
+        products = make_products()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(save_to_csv(products, os.path.join(self.temp_dir, "products.csv"), "parquet"))
+
+        df = pd.read_parquet(os.path.join(self.temp_dir, "products.parquet"))
+
+        # Parquet has no second resolution, so timestamps come back as milliseconds
+        expected = products.astype({"timestamp": "datetime64[ms]"})
+        self.assertEqual(df.dtypes.astype(str).to_dict(), expected.dtypes.astype(str).to_dict())
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_failure_names_the_format(self):
+        output = io.StringIO()
+        with mock.patch("utils.load.pq.write_table", side_effect=OSError("disk full")), \
+                contextlib.redirect_stdout(output):
+            self.assertFalse(save_to_csv(make_products(), os.path.join(self.temp_dir, "products.csv"), "parquet"))
+
+        self.assertEqual(output.getvalue(), "Error saving data to Parquet: disk full\n")
+
+
+class TestSaveToPostgresql(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("sqlalchemy.create_engine")
+        self.create_engine = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.engine = self.create_engine.return_value
+        self.connection = self.engine.begin.return_value.__enter__.return_value
+        self.cursor = self.connection.connection.cursor.return_value
+
+    def test_recreates_table_and_copies_rows(self):
+        self.assertTrue(save_to_postgresql(make_products(), "postgresql://user@localhost/db"))
+
+        self.create_engine.assert_called_once_with("postgresql://user@localhost/db")
+        self.assertEqual(self.connection.exec_driver_sql.call_args_list, [
+            mock.call(f"DROP TABLE IF EXISTS {POSTGRESQL_TABLE}"),
+            mock.call(
+                f'CREATE TABLE {POSTGRESQL_TABLE} ("Title" TEXT, "Price" DOUBLE PRECISION, '
+                '"Rating" DOUBLE PRECISION, "Colors" INTEGER, "Size" TEXT, "Gender" TEXT, '
+                '"timestamp" TIMESTAMP)'
+            ),
+        ])
+
+        sql, buffer = self.cursor.copy_expert.call_args.args
+        self.assertEqual(
+            sql,
+            f'COPY {POSTGRESQL_TABLE} ("Title", "Price", "Rating", "Colors", "Size", "Gender", "timestamp") '
+            'FROM STDIN WITH CSV'
+        )
+        self.assertEqual(
+            buffer.getvalue(),
+            b'"T-shirt 2",1634400,3.9,3,"M","Women",2025-05-13 21:58:00\n'
+            b'"Hoodie 3",7950080,4.8,5,"L","Unisex",2025-05-13 21:58:00\n'
+        )
+
+        self.cursor.close.assert_called_once()
+        self.engine.dispose.assert_called_once()
+
+    def test_returns_false_when_copy_fails(self):
+        self.cursor.copy_expert.side_effect = RuntimeError("connection lost")
+
+        self.assertFalse(save_to_postgresql(make_products(), "postgresql://user@localhost/db"))
+        self.engine.dispose.assert_called_once()
+
+    def test_returns_false_when_engine_cannot_be_created(self):
+        self.create_engine.side_effect = RuntimeError("bad connection string")
+
+        self.assertFalse(save_to_postgresql(make_products(), "not-a-url"))
+
+
+class TestSaveToGoogleSheets(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("utils.load.get_sheets_service")
+        self.get_sheets_service = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        spreadsheets = self.get_sheets_service.return_value.spreadsheets.return_value
+        self.batch_update = spreadsheets.batchUpdate
+        self.values_batch_update = spreadsheets.values.return_value.batchUpdate
+
+    def written_chunks(self):
+        """Return the (range, values) pairs sent through values().batchUpdate"""
+        chunks = []
+        for call in self.values_batch_update.call_args_list:
+            self.assertEqual(call.kwargs["spreadsheetId"], "sheet-id")
+            body = call.kwargs["body"]
+            self.assertEqual(body["valueInputOption"], "RAW")
+            chunks.extend((data["range"], data["values"]) for data in body["data"])
+        return chunks
+
+    def test_resizes_clears_and_writes_values(self):
+        self.assertTrue(save_to_google_sheets(make_products(), "sheet-id", "credentials.json"))
+
+        self.get_sheets_service.assert_called_once_with("credentials.json")
+        self.batch_update.assert_called_once_with(spreadsheetId="sheet-id", body={"requests": [
+            {
+                "updateSheetProperties": {
+                    "properties": {
+                        "sheetId": GOOGLE_WORKSHEET_ID,
+                        "gridProperties": {"rowCount": 3, "columnCount": 7},
+                    },
+                    "fields": "gridProperties(rowCount,columnCount)",
+                }
+            },
+            {"updateCells": {"range": {"sheetId": GOOGLE_WORKSHEET_ID}, "fields": "userEnteredValue"}},
+        ]})
+
+        # float32 values are sent at their shortest decimal form, timestamps as text
+        self.assertEqual(self.written_chunks(), [("A1", [
+            ["Title", "Price", "Rating", "Colors", "Size", "Gender", "timestamp"],
+            ["T-shirt 2", 1634400.0, 3.9, 3, "M", "Women", "2025-05-13 21:58:00"],
+            ["Hoodie 3", 7950080.0, 4.8, 5, "L", "Unisex", "2025-05-13 21:58:00"],
+        ])])
+
+    def test_missing_values_are_written_as_empty_cells(self):
+        df = make_products()
+        df.loc[1, "Rating"] = None
+
+        self.assertTrue(save_to_google_sheets(df, "sheet-id"))
+        self.assertEqual(self.written_chunks()[0][1][2][2], "")
+
+    def test_header_and_rows_fitting_one_chunk_are_sent_at_once(self):
+        df = make_products().sample(GOOGLE_SHEETS_CHUNK_ROWS - 1, replace=True, ignore_index=True)
+
+        self.assertTrue(save_to_google_sheets(df, "sheet-id"))
+        chunks = self.written_chunks()
+        self.assertEqual([(cell_range, len(values)) for cell_range, values in chunks], [
+            ("A1", GOOGLE_SHEETS_CHUNK_ROWS),
+        ])
+
+    def test_large_frames_are_written_in_chunks(self):
+        df = make_products().sample(GOOGLE_SHEETS_CHUNK_ROWS, replace=True, ignore_index=True)
+
+        self.assertTrue(save_to_google_sheets(df, "sheet-id"))
+        chunks = self.written_chunks()
+        self.assertEqual([(cell_range, len(values)) for cell_range, values in chunks], [
+            ("A1", GOOGLE_SHEETS_CHUNK_ROWS),
+            (f"A{GOOGLE_SHEETS_CHUNK_ROWS + 1}", 1),
+        ])
+        self.assertEqual(self.values_batch_update.call_count, 2)
+
+        # The last data row lands right after the first chunk
+        self.assertEqual(chunks[1][1][0][0], df["Title"].iloc[-1])
+
+    def test_returns_false_on_api_error(self):
+        self.batch_update.return_value.execute.side_effect = RuntimeError("quota exceeded")
+
+        self.assertFalse(save_to_google_sheets(make_products(), "sheet-id"))
+        self.values_batch_update.assert_not_called()
+
+
+class TestSheetsService(unittest.TestCase):
+    def setUp(self):
+        get_sheets_service.cache_clear()
+        self.addCleanup(get_sheets_service.cache_clear)
+
+    def build_model(self):
+        """Build the Sheets client with patched Google libraries and return its JSON model"""
+        with mock.patch("googleapiclient.discovery.build") as build, \
+                mock.patch("google.oauth2.service_account.Credentials.from_service_account_file"):
+            get_sheets_service("credentials.json")
+        return build.call_args.kwargs["model"]
+
+    def test_orjson_model_serializes_like_json_model(self):
+        model_class = type(self.build_model())
+        bodies = [
+            {
+                "valueInputOption": "RAW",
+                "data": [{"range": "A1", "values": [["Title", "Price"], ["Kemeja \u00e9", 1634400.0], ["", 3.9]]}],
+            },
+            {"requests": [{"updateCells": {"range": {"sheetId": 0}, "fields": "userEnteredValue"}}]},
+        ]
+
+        for body in bodies:
+            for data_wrapper in (False, True):
+                with self.subTest(body=list(body), data_wrapper=data_wrapper):
+                    expected = JsonModel(data_wrapper=data_wrapper).serialize(body)
+                    actual = model_class(data_wrapper=data_wrapper).serialize(body)
+                    self.assertIsInstance(actual, str)
+                    self.assertEqual(json.loads(actual), json.loads(expected))
+
+    def test_service_is_cached_per_credentials_file(self):
+        with mock.patch("googleapiclient.discovery.build") as build, \
+                mock.patch("google.oauth2.service_account.Credentials.from_service_account_file"):
+            first = get_sheets_service("credentials.json")
+            second = get_sheets_service("credentials.json")
+
+        self.assertIs(first, second)
+        build.assert_called_once()
+
+
+class TestLoadData(unittest.TestCase):
+    def setUp(self):
+        self.sinks = {}
+        for name in ("save_to_csv", "save_to_google_sheets", "save_to_postgresql"):
+            patcher = mock.patch(f"utils.load.{name}", return_value=True)
+            self.sinks[name] = patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_unconfigured_repositories_are_skipped(self):
+        df = make_products()
+
+        self.assertEqual(load_data(df, "out/products.csv"), {"csv": True, "google_sheets": None, "postgresql": None})
+        self.sinks["save_to_csv"].assert_called_once_with(df, "out/products.csv", "csv")
+        self.sinks["save_to_google_sheets"].assert_not_called()
+        self.sinks["save_to_postgresql"].assert_not_called()
+
+    def test_saves_to_every_configured_repository(self):
+        df = make_products()
+
+        results = load_data(df, google_sheet_id="sheet-id", postgresql_conn_string="postgresql://localhost/db",
+                            google_credentials_path="credentials.json")
+
+        self.assertEqual(results, {"csv": True, "google_sheets": True, "postgresql": True})
+        self.sinks["save_to_google_sheets"].assert_called_once_with(df, "sheet-id", "credentials.json")
+        self.sinks["save_to_postgresql"].assert_called_once_with(df, "postgresql://localhost/db")
+
+    def test_one_failing_repository_does_not_affect_the_others(self):
+        self.sinks["save_to_google_sheets"].return_value = False
+
+        results = load_data(make_products(), google_sheet_id="sheet-id",
+                            postgresql_conn_string="postgresql://localhost/db")
+
+        self.assertEqual(results, {"csv": True, "google_sheets": False, "postgresql": True})
+
+    def test_output_format_is_passed_to_save_to_csv(self):
+        df = make_products()
+
+        load_data(df, "products.csv", output_format="parquet")
+
+        self.sinks["save_to_csv"].assert_called_once_with(df, "products.csv", "parquet")
+
+    def test_empty_data_is_not_loaded(self):
+        for name, df in {"missing": None, "empty": make_products().iloc[:0]}.items():
+            with self.subTest(name):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results = load_data(df, google_sheet_id="sheet-id")
+
+                self.assertEqual(results, {"csv": False, "google_sheets": False, "postgresql": False})
+        for sink in self.sinks.values():
+            sink.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
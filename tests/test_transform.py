@@ -0,0 +1,134 @@
+import unittest
+
+import pandas as pd
+
+from utils.transform import (
+    _COLORS_PATTERN,
+    _PRICE_PATTERN,
+    _RATING_PATTERN,
+    combine_chunks,
+    extract_number,
+    remove_prefix,
+    transform_data,
+)
+
+
+def make_raw(*rows, timestamp="2025-05-13 21:58:00"):
+    """Build a raw page as scraped, one (title, price, rating, colors, size, gender) tuple per row"""
+    columns = ["Title", "Price", "Rating", "Colors", "Size", "Gender"]
+    df = pd.DataFrame(list(rows), columns=columns)
+    df["timestamp"] = timestamp
+    return df
+
+
+T_SHIRT = ("T-shirt 2", "$102.15", "Rating: ⭐ 3.9 / 5", "3 Colors", "Size: M", "Gender: Women")
+HOODIE = ("Hoodie 3", "$496.88", "Rating: ⭐ 4.8 / 5", "5 Colors", "Size: L", "Gender: Unisex")
+
+
+class TestExtractNumber(unittest.TestCase):
+    def test_extracts_named_group(self):
+        column = pd.Series(["$102.15", "$12", "Price Unavailable", None], index=[3, 4, 5, 6])
+
+        numbers = extract_number(column, _PRICE_PATTERN)
+
+        self.assertEqual(numbers.index.tolist(), [3, 4, 5, 6])
+        self.assertEqual(numbers.tolist()[:2], [102.15, 12.0])
+        self.assertTrue(numbers.iloc[2:].isna().all())
+
+    def test_rating_and_colors_patterns(self):
+        ratings = extract_number(pd.Series(["Rating: ⭐ 4.5 / 5", "Rating: ⭐ Invalid Rating / 5", "Not Rated"]),
+                                 _RATING_PATTERN)
+        colors = extract_number(pd.Series(["3 Colors", "Colors"]), _COLORS_PATTERN)
+
+        self.assertEqual(ratings.iloc[0], 4.5)
+        self.assertTrue(ratings.iloc[1:].isna().all())
+        self.assertEqual(colors.iloc[0], 3.0)
+        self.assertTrue(pd.isna(colors.iloc[1]))
+
+
+class TestRemovePrefix(unittest.TestCase):
+    def test_removes_prefix_only_where_present(self):
+        column = pd.Series(["Size: M", "XL", None], index=[1, 2, 3])
+
+        stripped = remove_prefix(column, "Size: ")
+
+        self.assertEqual(stripped.index.tolist(), [1, 2, 3])
+        self.assertEqual(stripped.tolist()[:2], ["M", "XL"])
+        self.assertTrue(pd.isna(stripped.iloc[2]))
+        self.assertEqual(str(stripped.dtype), "string[pyarrow]")
+
+
+class TestTransformData(unittest.TestCase):
+    def test_converts_values_and_types(self):
+        df = transform_data(make_raw(T_SHIRT, HOODIE))
+
+        self.assertEqual(df["Title"].tolist(), ["T-shirt 2", "Hoodie 3"])
+        self.assertEqual(df["Price"].tolist(), [1634400.0, 7950080.0])
+        self.assertEqual(df["Rating"].astype(str).tolist(), ["3.9", "4.8"])
+        self.assertEqual(df["Colors"].tolist(), [3, 5])
+        self.assertEqual(df["Size"].tolist(), ["M", "L"])
+        self.assertEqual(df["Gender"].tolist(), ["Women", "Unisex"])
+        self.assertEqual(df["timestamp"].iloc[0], pd.Timestamp("2025-05-13 21:58:00"))
+
+        self.assertEqual(df.drop(columns="Title").dtypes.astype(str).to_dict(), {
+            "Price": "float32",
+            "Rating": "float32",
+            "Colors": "int16",
+            "Size": "category",
+            "Gender": "category",
+            "timestamp": "datetime64[s]",
+        })
+
+    def test_drops_invalid_rows(self):
+        invalid_rows = {
+            "price unavailable": ("Pants 4", "Price Unavailable", *T_SHIRT[2:]),
+            "invalid rating": ("Pants 5", "$10.00", "Rating: ⭐ Invalid Rating / 5", *T_SHIRT[3:]),
+            "not rated": ("Pants 6", "$10.00", "Not Rated", *T_SHIRT[3:]),
+            "unknown product": ("Unknown Product", *T_SHIRT[1:]),
+        }
+
+        for name, row in invalid_rows.items():
+            with self.subTest(name):
+                df = transform_data(make_raw(T_SHIRT, row))
+                self.assertEqual(df["Title"].tolist(), ["T-shirt 2"])
+
+    def test_duplicates_are_dropped_whatever_their_timestamp(self):
+        raw = pd.concat([
+            make_raw(T_SHIRT, HOODIE, timestamp="2025-05-13 21:58:00"),
+            make_raw(T_SHIRT, timestamp="2025-05-13 22:10:00"),
+        ], ignore_index=True)
+
+        df = transform_data(raw)
+
+        self.assertEqual(df["Title"].tolist(), ["T-shirt 2", "Hoodie 3"])
+        self.assertEqual(df.index.tolist(), [0, 1])
+        self.assertEqual(df["timestamp"].iloc[0], pd.Timestamp("2025-05-13 21:58:00"))
+
+
+class TestCombineChunks(unittest.TestCase):
+    def test_deduplicates_across_chunks_with_different_categories(self):
+        first = transform_data(make_raw(T_SHIRT))
+        second = transform_data(make_raw(HOODIE, T_SHIRT, timestamp="2025-05-13 22:10:00"))
+
+        df = combine_chunks([first, second])
+
+        self.assertEqual(df["Title"].tolist(), ["T-shirt 2", "Hoodie 3"])
+        self.assertEqual(df.index.tolist(), [0, 1])
+        for column in ("Size", "Gender"):
+            self.assertEqual(df[column].dtype, "category")
+        self.assertEqual(df["Price"].dtype, "float32")
+        self.assertEqual(df["Colors"].dtype, "int16")
+
+    def test_empty_chunks_are_skipped(self):
+        empty = transform_data(make_raw(("Unknown Product", *T_SHIRT[1:])))
+        self.assertTrue(empty.empty)
+
+        df = combine_chunks([empty, transform_data(make_raw(T_SHIRT))])
+        self.assertEqual(df["Title"].tolist(), ["T-shirt 2"])
+        self.assertEqual(df["Size"].dtype, "category")
+
+        self.assertTrue(combine_chunks([empty]).empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,126 +1,359 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from datetime import datetime
-import time
+import hashlib
+import json
+import os
 import random
 import re
+import time
+
+# Default headers sent with every page request
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; FashionStudioETL/1.0)',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+# Retry policy for dropped connections, timeouts and transient server errors
+MAX_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Maximum number of requests in flight at once
+MAX_CONCURRENT_REQUESTS = 5
+
+# Adaptive delay before each request, in seconds: it shrinks by a fixed step after
+# every success and doubles whenever the server pushes back, within these bounds.
+# A small random jitter is added so requests don't reach the server in lockstep
+REQUEST_DELAY_INITIAL = 0.2
+REQUEST_DELAY_MIN = 0.1
+REQUEST_DELAY_MAX = 5.0
+REQUEST_DELAY_STEP = 0.05
+REQUEST_JITTER = 0.1
 
-def scrape_page(url, session=None):
+# Patterns for the price text and for the page number in pagination links
+_PRICE_RE = re.compile(r'\$\d+\.\d+')
+_PAGE_NUMBER_RE = re.compile(r'(.*\D)2(\D*)')
+
+# On-disk page cache, so reruns during development skip the network
+CACHE_DIR = ".scrape_cache"
+CACHE_TTL = 3600
+
+def get_cache_ttl(cache_control):
     """
-    Scrape data from a single page of Fashion Studio website
+    Work out how long a response may be cached from its Cache-Control header
     
     Args:
-        url (str): URL of the page to scrape
-        session (requests.Session, optional): Session for making HTTP requests
+        cache_control (str or None): Value of the Cache-Control header
+        
+    Returns:
+        int: Number of seconds to keep the page, 0 if it must not be cached
+    """
+    if not cache_control:
+        return CACHE_TTL
+    
+    directives = [directive.strip().lower() for directive in cache_control.split(',')]
+    if 'no-store' in directives or 'no-cache' in directives:
+        return 0
+    
+    for directive in directives:
+        if directive.startswith('max-age='):
+            try:
+                return min(int(directive.split('=', 1)[1]), CACHE_TTL)
+            except ValueError:
+                break
+    
+    return CACHE_TTL
+
+def get_cache_path(url):
+    """
+    Build the cache file path for a URL
+    
+    Args:
+        url (str): URL of the page
+        
+    Returns:
+        str: Path of the cache file
+    """
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest() + ".json")
+
+def load_cached_page(url):
+    """
+    Read a page from the cache
+    
+    Args:
+        url (str): URL of the page
         
     Returns:
-        list: List of dictionaries containing product data
+        str or None: Cached HTML, or None if missing or expired
+    """
+    try:
+        with open(get_cache_path(url), encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if entry.get('expires', 0) < time.time():
+        return None
+    return entry.get('html')
+
+def save_cached_page(url, html, ttl):
     """
-    if session is None:
-        session = requests.Session()
+    Write a page to the cache
+    
+    Args:
+        url (str): URL of the page
+        html (str): Raw HTML of the page
+        ttl (int): Number of seconds the entry stays valid
+    """
+    if ttl <= 0:
+        return
     
     try:
-        response = session.get(url)
-        response.raise_for_status()
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(get_cache_path(url), 'w', encoding='utf-8') as f:
+            json.dump({'url': url, 'expires': time.time() + ttl, 'html': html}, f)
+    except OSError as e:
+        print(f"Error caching page {url}: {str(e)}")
+
+def get_page_url_template(next_url):
+    """
+    Work out how listing pages are addressed from the link to the second page
+    
+    Args:
+        next_url (str): URL of the second page
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        products_data = []
+    Returns:
+        tuple or None: URL prefix and suffix around the page number, or None
+            if the page number cannot be located in the URL
+    """
+    match = _PAGE_NUMBER_RE.fullmatch(next_url)
+    if not match:
+        return None
+    return match.group(1), match.group(2)
+
+def get_page_url(base_url, page, template):
+    """
+    Build the URL of a listing page
+    
+    Args:
+        base_url (str): Base URL of the website
+        page (int): Page number, starting from 1
+        template (tuple): URL prefix and suffix around the page number, as
+            returned by get_page_url_template
         
-        # Find all product containers
-        product_containers = soup.find_all('div', class_='collection-card')
+    Returns:
+        str: URL of the requested page
+    """
+    # The first page lives at the site root
+    if page == 1:
+        return base_url
+    prefix, suffix = template
+    return f"{prefix}{page}{suffix}"
+
+def parse_page(html):
+    """
+    Parse the HTML of a single page and extract its product data
+    
+    Args:
+        html (str): Raw HTML of the page
         
-        for product in product_containers:
-            try:
-                # Extract product details
-                product_details = product.find('div', class_='product-details')
-                if not product_details:
-                    continue
-                
-                # Title
-                title_element = product_details.find('h3', class_='product-title')
-                title = title_element.text.strip() if title_element else "Unknown Product"
-                
-                # Price - could be displayed in different ways
-                # Check if price is displayed as "Price Unavailable"
-                if product_details.find(string="Price Unavailable"):
-                    price = "Price Unavailable"
+    Returns:
+        pandas.DataFrame: DataFrame containing the product data of the page
+    """
+    return to_dataframe(scrape_page_from_tree(LexborHTMLParser(html)))
+
+def scrape_page_from_tree(tree):
+    """
+    Extract product data from an already parsed page
+    
+    Args:
+        tree (selectolax.lexbor.LexborHTMLParser): Parsed HTML of the page
+        
+    Returns:
+        dict: List of values per product column, one entry per product
+    """
+    titles, prices, ratings, colors, sizes, genders = [], [], [], [], [], []
+    
+    # Every product on the page shares the same scrape timestamp
+    timestamp = datetime.now().replace(microsecond=0)
+    
+    # Find the details block of every product container
+    product_containers = tree.css('div.collection-card div.product-details')
+    
+    for product_details in product_containers:
+        try:
+            # Title
+            title_element = product_details.css_first('h3.product-title')
+            title = title_element.text().strip() if title_element else "Unknown Product"
+            
+            # Price - could be displayed in different ways
+            # Check if price is displayed as "Price Unavailable"
+            if any(element.text(deep=False) == "Price Unavailable" for element in product_details.css('*')):
+                price = "Price Unavailable"
+            else:
+                # Look for price with $ symbol
+                price_tags = [element for element in product_details.css('span, p') if _PRICE_RE.search(element.text())]
+                if price_tags:
+                    price = price_tags[0].text().strip() if price_tags else "Unavailable"
                 else:
-                    # Look for price with $ symbol
-                    price_tags = product_details.find_all(['span', 'p'], string=re.compile(r'\$\d+\.\d+'))
-                    if price_tags:
-                        price = price_tags[0].text.strip() if price_tags else "Unavailable"
-                    else:
-                        price = None
-                
-                # Rating
-                rating_text = None
-                rating_elements = product_details.find_all('p')
-                for element in rating_elements:
-                    if 'Rating:' in element.text:
-                        rating_text = element.text.strip()
-                        break
-                
-                # Colors
-                colors_text = None
-                for element in rating_elements:
-                    if 'Colors' in element.text and 'Rating' not in element.text:
-                        colors_text = element.text.strip()
-                        break
-                
-                # Size
-                size_text = None
-                for element in rating_elements:
-                    if 'Size:' in element.text:
-                        size_text = element.text.strip()
-                        break
-                
-                # Gender
-                gender_text = None
-                for element in rating_elements:
-                    if 'Gender:' in element.text:
-                        gender_text = element.text.strip()
-                        break
-                
-                # Add timestamp
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                
-                products_data.append({
-                    'Title': title,
-                    'Price': price,
-                    'Rating': rating_text,
-                    'Colors': colors_text,
-                    'Size': size_text,
-                    'Gender': gender_text,
-                    'timestamp': timestamp
-                })
-                
-            except Exception as e:
-                print(f"Error extracting product data: {str(e)}")
-                continue
+                    price = None
+            
+            # Rating, colors, size and gender, in a single pass over the detail
+            # paragraphs. Each field keeps the first paragraph that matches it
+            rating_text = colors_text = size_text = gender_text = None
+            for element in product_details.css('p'):
+                text = element.text().strip()
+                if rating_text is None and 'Rating:' in text:
+                    rating_text = text
+                if colors_text is None and 'Colors' in text and 'Rating' not in text:
+                    colors_text = text
+                if size_text is None and 'Size:' in text:
+                    size_text = text
+                if gender_text is None and 'Gender:' in text:
+                    gender_text = text
+            
+            titles.append(title)
+            prices.append(price)
+            ratings.append(rating_text)
+            colors.append(colors_text)
+            sizes.append(size_text)
+            genders.append(gender_text)
+            
+        except Exception as e:
+            print(f"Error extracting product data: {str(e)}")
+            continue
+    
+    return {
+        'Title': titles,
+        'Price': prices,
+        'Rating': ratings,
+        'Colors': colors,
+        'Size': sizes,
+        'Gender': genders,
+        'timestamp': [timestamp] * len(titles)
+    }
+
+class AdaptiveDelay:
+    """
+    Delay before each request that adapts to how the server responds
+    
+    One instance is shared by every request of a scrape, so a server that
+    starts answering 429 or 503 slows all of them down at once.
+    """
+    
+    def __init__(self, delay=REQUEST_DELAY_INITIAL):
+        self.delay = delay
+    
+    async def wait(self):
+        """Sleep for the current delay plus a random jitter of up to REQUEST_JITTER"""
+        await asyncio.sleep(self.delay + random.uniform(0, REQUEST_JITTER))
+    
+    def success(self):
+        """Lower the delay by REQUEST_DELAY_STEP, down to REQUEST_DELAY_MIN"""
+        self.delay = max(REQUEST_DELAY_MIN, self.delay - REQUEST_DELAY_STEP)
+    
+    def backoff(self):
+        """Double the delay, up to REQUEST_DELAY_MAX"""
+        self.delay = min(REQUEST_DELAY_MAX, self.delay * 2)
+
+async def fetch_html(session, url, use_cache=True, semaphore=None, delay=None):
+    """
+    Fetch the HTML of a single page of Fashion Studio website
+    
+    Args:
+        session (aiohttp.ClientSession): Session for making HTTP requests
+        url (str): URL of the page
+        use_cache (bool): Serve the page from the on-disk cache when possible
+        semaphore (asyncio.Semaphore, optional): Limits the requests in flight
+        delay (AdaptiveDelay, optional): Paces the requests sent to the server
         
-        return products_data
+    Returns:
+        str: Raw HTML of the page
+    """
+    html = load_cached_page(url) if use_cache else None
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    if delay is None:
+        delay = AdaptiveDelay()
     
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching page {url}: {str(e)}")
-        return []
+    for attempt in range(MAX_RETRIES + 1):
+        if html is not None:
+            break
+        
+        # Wait inside the semaphore, so the request rate stays bounded by the
+        # concurrency limit over the current delay
+        async with semaphore:
+            await delay.wait()
+            
+            try:
+                async with session.get(url) as response:
+                    if response.status in RETRY_STATUS_CODES:
+                        delay.backoff()
+                    retry = response.status in RETRY_STATUS_CODES and attempt < MAX_RETRIES
+                    if not retry:
+                        response.raise_for_status()
+                        html = await response.text()
+                        delay.success()
+                        if use_cache:
+                            save_cached_page(url, html, get_cache_ttl(response.headers.get('Cache-Control')))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                delay.backoff()
+                if attempt == MAX_RETRIES:
+                    raise
+                retry = True
+        
+        if not retry:
+            break
+        
+        # Back off exponentially before retrying
+        await asyncio.sleep(RETRY_BACKOFF_FACTOR * (2 ** attempt))
+    
+    return html
 
-def get_next_page_url(current_url, soup):
+async def fetch_page(session, url, use_cache=True, semaphore=None, delay=None):
+    """
+    Fetch a single page of Fashion Studio website and extract its products
+    
+    Args:
+        session (aiohttp.ClientSession): Session for making HTTP requests
+        url (str): URL of the page to scrape
+        use_cache (bool): Serve the page from the on-disk cache when possible
+        semaphore (asyncio.Semaphore, optional): Limits the requests in flight
+        delay (AdaptiveDelay, optional): Paces the requests sent to the server
+        
+    Returns:
+        pandas.DataFrame: DataFrame containing the product data of the page
+    """
+    html = await fetch_html(session, url, use_cache=use_cache, semaphore=semaphore, delay=delay)
+    
+    # Parse in a worker thread so the event loop keeps serving other pages
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, parse_page, html)
+
+def get_next_page_url(current_url, tree):
     """
     Extract the URL for the next page
     
     Args:
         current_url (str): Current page URL
-        soup (BeautifulSoup): Parsed HTML of the current page
+        tree (selectolax.lexbor.LexborHTMLParser): Parsed HTML of the current page
         
     Returns:
         str or None: URL for the next page or None if no next page
     """
     try:
         # Find the "Next" link in pagination
-        next_link = soup.find('a', class_='page-link', string='Next')
-        if next_link and 'href' in next_link.attrs:
-            next_href = next_link['href']
+        next_link = next(
+            (link for link in tree.css('a.page-link[href]') if link.text().strip() == 'Next'),
+            None
+        )
+        if next_link:
+            next_href = next_link.attributes['href']
             
             # Handle relative URLs
             if next_href.startswith('/'):
@@ -133,78 +366,226 @@ def get_next_page_url(current_url, soup):
         print(f"Error getting next page URL: {str(e)}")
         return None
 
-def scrape_main(base_url="https://fashion-studio.dicoding.dev", max_pages=50):
+def to_dataframe(columns):
+    """
+    Convert scraped product columns to a DataFrame
+    
+    Args:
+        columns (dict): List of values per product column
+        
+    Returns:
+        pandas.DataFrame: DataFrame containing the product data
+    """
+    # Build every column straight into its final type: the scraped text as Arrow
+    # strings, so cleaning it does not box every cell, and the timestamp in seconds
+    text_type = pd.ArrowDtype(pa.string())
+    return pd.DataFrame({
+        column: pd.array(values, dtype='datetime64[s]' if column == 'timestamp' else text_type)
+        for column, values in columns.items()
+    }, copy=False)
+
+async def follow_next_links(session, next_url, max_pages, use_cache=True, semaphore=None, delay=None):
+    """
+    Scrape pages one after another by following their "Next" links, starting
+    from the second page
+    
+    Args:
+        session (aiohttp.ClientSession): Session for making HTTP requests
+        next_url (str): URL of the second page
+        max_pages (int): Maximum number of pages to scrape, including the first
+        use_cache (bool): Serve pages from the on-disk cache when possible
+        semaphore (asyncio.Semaphore, optional): Limits the requests in flight
+        delay (AdaptiveDelay, optional): Paces the requests sent to the server
+        
+    Yields:
+        pandas.DataFrame: Product data of one page, in page order
+    """
+    loop = asyncio.get_running_loop()
+    
+    for current_page in range(2, max_pages + 1):
+        try:
+            html = await fetch_html(session, next_url, use_cache=use_cache, semaphore=semaphore, delay=delay)
+            tree = await loop.run_in_executor(None, LexborHTMLParser, html)
+        except Exception as e:
+            report_page_error(current_page, e)
+            return
+        
+        page_products = to_dataframe(scrape_page_from_tree(tree))
+        if page_products.empty:
+            print(f"No products found on page {current_page}. Stopping.")
+            return
+        
+        print(f"Products found on page {current_page}: {len(page_products)}")
+        yield page_products
+        
+        next_url = get_next_page_url(next_url, tree)
+        if not next_url:
+            print("No next page found. Stopping.")
+            return
+
+def report_page_error(page, error):
+    """
+    Print why a page could not be scraped
+    
+    Args:
+        page (int): Page number
+        error (Exception): Error raised while fetching or parsing the page
+    """
+    if isinstance(error, aiohttp.ClientError):
+        print(f"Error fetching page {page}: {str(error)}")
+    elif isinstance(error, asyncio.TimeoutError):
+        print(f"Error fetching page {page}: request timed out")
+    else:
+        print(f"Unexpected error on page {page}: {str(error)}")
+
+async def iter_pages(base_url="https://fashion-studio.dicoding.dev", max_pages=50, use_cache=True):
     """
-    Scrape multiple pages from Fashion Studio website
+    Scrape multiple pages from Fashion Studio website concurrently, yielding
+    each page as soon as it and every page before it are done
     
     Args:
         base_url (str): Base URL of the website
         max_pages (int): Maximum number of pages to scrape
+        use_cache (bool): Serve pages from the on-disk cache when possible
         
-    Returns:
-        pandas.DataFrame: DataFrame containing all scraped product data
+    Yields:
+        pandas.DataFrame: Product data of one page, in page order
     """
-    all_products = []
-    session = requests.Session()
+    if max_pages < 1:
+        return
     
-    try:
-        current_url = base_url
-        current_page = 1
+    # One pooled session so every page reuses the same keep-alive connections. The
+    # semaphore caps the requests in flight, so the pool never needs more connections
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_REQUESTS, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector, headers=HEADERS) as session:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        delay = AdaptiveDelay()
         
-        while current_page <= max_pages:
-            print(f"Scraping page {current_page} of {max_pages}...")
-            
-            try:
-                # Get page content
-                response = session.get(current_url)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Scrape products from current page
-                page_products = scrape_page(current_url, session)
-                
-                if not page_products:
-                    print(f"No products found on page {current_page}. Stopping.")
+        # Probe the first page on its own to learn how the other pages are addressed
+        try:
+            tree = LexborHTMLParser(await fetch_html(
+                session, base_url, use_cache=use_cache, semaphore=semaphore, delay=delay
+            ))
+        except Exception as e:
+            report_page_error(1, e)
+            return
+        
+        page_products = to_dataframe(scrape_page_from_tree(tree))
+        if page_products.empty:
+            print("No products found on page 1. Stopping.")
+            return
+        
+        print(f"Products found on page 1: {len(page_products)}")
+        yield page_products
+        
+        next_url = get_next_page_url(base_url, tree)
+        if not next_url:
+            print("No next page found. Stopping.")
+            return
+        
+        template = get_page_url_template(next_url)
+        if template is None:
+            # The page number can't be located in the link, so the other pages can't be
+            # addressed up front. Follow the "Next" links one page at a time instead
+            async for page_products in follow_next_links(
+                session, next_url, max_pages, use_cache=use_cache, semaphore=semaphore, delay=delay
+            ):
+                yield page_products
+            return
+        
+        tasks = [
+            asyncio.ensure_future(fetch_page(
+                session, get_page_url(base_url, page, template),
+                use_cache=use_cache, semaphore=semaphore, delay=delay
+            ))
+            for page in range(2, max_pages + 1)
+        ]
+        
+        try:
+            # Hand pages out in order, stopping at the first one that failed or was empty
+            for current_page, task in enumerate(tasks, start=2):
+                try:
+                    page_products = await task
+                except aiohttp.ClientResponseError as e:
+                    # Pages are requested up to max_pages without knowing how many the site
+                    # has, so a missing page after the first is the normal end of the listing
+                    if e.status == 404:
+                        print(f"No more pages after page {current_page - 1}. Stopping.")
+                    else:
+                        report_page_error(current_page, e)
                     break
-                    
-                all_products.extend(page_products)
-                print(f"Products found on page {current_page}: {len(page_products)}")
-                
-                # Find URL for next page
-                next_url = get_next_page_url(current_url, soup)
-                
-                if not next_url:
-                    print("No next page found. Stopping.")
+                except Exception as e:
+                    report_page_error(current_page, e)
                     break
-                    
-                current_url = next_url
-                current_page += 1
                 
-                # Random delay to avoid overloading the server
-                time.sleep(random.uniform(1, 3))
+                if page_products.empty:
+                    print(f"No products found on page {current_page}. Stopping.")
+                    break
                 
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching page {current_page}: {str(e)}")
-                break
-            except Exception as e:
-                print(f"Unexpected error on page {current_page}: {str(e)}")
-                break
+                print(f"Products found on page {current_page}: {len(page_products)}")
+                yield page_products
+        
+        finally:
+            # Stop fetching pages that are no longer needed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+async def save_raw_pages(pages, output_path):
+    """
+    Write every scraped page to a CSV file as it passes through
     
-    except Exception as e:
-        print(f"Error in main scraping process: {str(e)}")
-        return None
+    A single pyarrow CSV writer is kept open for the whole run, so the header
+    is written once and each page is appended as soon as it arrives.
+    
+    Args:
+        pages: Async iterator of page DataFrames, such as iter_pages
+        output_path (str): Path of the CSV file to write
+        
+    Yields:
+        pandas.DataFrame: The same pages, unchanged
+    """
+    writer = None
+    
+    try:
+        async for page in pages:
+            table = pa.Table.from_pandas(page, preserve_index=False)
+            if writer is None:
+                writer = pacsv.CSVWriter(output_path, table.schema)
+            writer.write_table(table)
+            yield page
+    finally:
+        if writer is not None:
+            writer.close()
+
+async def scrape_to_csv(output_path, base_url="https://fashion-studio.dicoding.dev", max_pages=50, use_cache=True):
+    """
+    Scrape multiple pages from Fashion Studio website and append each page
+    to a CSV file as soon as it arrives, so memory use stays flat however
+    many pages are scraped
     
-    # Convert to DataFrame
-    df = pd.DataFrame(all_products)
-    print(f"Total products scraped: {len(df)}")
+    Args:
+        output_path (str): Path of the CSV file to write
+        base_url (str): Base URL of the website
+        max_pages (int): Maximum number of pages to scrape
+        use_cache (bool): Serve pages from the on-disk cache when possible
+        
+    Returns:
+        int: Number of products written
+    """
+    rows = 0
+    
+    async for page in save_raw_pages(iter_pages(base_url, max_pages, use_cache), output_path):
+        rows += len(page)
     
-    return df
+    print(f"Total products scraped: {rows}")
+    return rows
 
 if __name__ == "__main__":
     # Test the scraper
-    df = scrape_main(max_pages=50)
-    if df is not None:
-        print(df.head())
-        df.to_csv("raw_products.csv", index=False)
-    else:
-        print("Scraping failed.")
\ No newline at end of file
+    try:
+        rows = asyncio.run(scrape_to_csv("raw_products.csv", max_pages=50))
+        if rows:
+            print("Raw data saved to raw_products.csv")
+    except Exception as e:
+        print(f"Scraping failed: {str(e)}")
\ No newline at end of file
@@ -1,13 +1,82 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import io
 import os
 
-def save_to_csv(df, output_path="products.csv"):
+# Rows serialized per batch by the pyarrow CSV writer for PostgreSQL COPY
+CSV_BATCH_SIZE = 8192
+
+# Size of the output buffer, so batches reach the OS in large blocks
+CSV_BUFFER_SIZE = 1024 * 1024
+
+# Rows per row group in Parquet output
+PARQUET_ROW_GROUP_SIZE = 50_000
+
+# Google Sheets access through a service account
+GOOGLE_CREDENTIALS_PATH = "google-sheets-api.json"
+GOOGLE_SHEETS_SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+GOOGLE_WORKSHEET_ID = 0
+
+# Rows sent per values.batchUpdate call, to stay under the API request size limit
+GOOGLE_SHEETS_CHUNK_ROWS = 5000
+
+# Table receiving the transformed products in PostgreSQL
+POSTGRESQL_TABLE = "fashion_products"
+POSTGRESQL_COLUMNS = {
+    "Title": "TEXT",
+    "Price": "DOUBLE PRECISION",
+    "Rating": "DOUBLE PRECISION",
+    "Colors": "INTEGER",
+    "Size": "TEXT",
+    "Gender": "TEXT",
+    "timestamp": "TIMESTAMP",
+}
+
+def widen_float32_columns(df):
+    """
+    Widen float32 columns to float64 through their shortest decimal text
+    
+    Converting directly would turn a rating of 3.9 into 3.9000000953674316.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame to convert
+        
+    Returns:
+        pandas.DataFrame: DataFrame with float64 instead of float32 columns
+    """
+    float32_columns = df.select_dtypes("float32").columns
+    return df.astype({column: "str" for column in float32_columns}).astype(
+        {column: "float64" for column in float32_columns}
+    )
+
+def write_products_csv(df, output_path):
+    """
+    Write transformed products to a CSV file with pandas
+    
+    pyarrow's writer quotes every string and drops the ".0" of whole floats,
+    so Price would read back as integers. pandas keeps the file in the format
+    consumers already read.
+    
+    Args:
+        df (pandas.DataFrame): Transformed DataFrame to write
+        output_path (str): Path of the CSV file
+    """
+    with open(output_path, "w", buffering=CSV_BUFFER_SIZE, newline="") as sink:
+        widen_float32_columns(df).to_csv(sink, index=False)
+
+def save_to_csv(df, output_path="products.csv", file_format="csv"):
     """
-    Save DataFrame to CSV file
+    Save DataFrame to CSV file, or to a Parquet file next to it
     
     Args:
         df (pandas.DataFrame): DataFrame to save
         output_path (str): Path to save the CSV file
+        file_format (str): "csv", or "parquet" to write a snappy-compressed
+            Parquet file with the same name and a .parquet extension
         
     Returns:
         bool: True if successful, False otherwise
@@ -18,23 +87,180 @@ def save_to_csv(df, output_path="products.csv"):
         if dir_name:
             os.makedirs(dir_name, exist_ok=True)
         
-        df.to_csv(output_path, index=False)
+        if file_format == "parquet":
+            output_path = os.path.splitext(output_path)[0] + ".parquet"
+            pq.write_table(
+                pa.Table.from_pandas(df, preserve_index=False),
+                output_path,
+                compression="snappy",
+                row_group_size=PARQUET_ROW_GROUP_SIZE
+            )
+        else:
+            write_products_csv(df, output_path)
         print(f"Data successfully saved to {output_path}")
         return True
     
     except Exception as e:
-        print(f"Error saving data to CSV: {str(e)}")
+        print(f"Error saving data to {'Parquet' if file_format == 'parquet' else 'CSV'}: {str(e)}")
+        return False
+
+@functools.lru_cache(maxsize=4)
+def get_sheets_service(credentials_path):
+    """
+    Build a Google Sheets API client, cached per credentials file
+    
+    The Google client libraries and orjson are imported here rather than at
+    module level, so runs that only write a file never pay for importing them.
+    
+    Args:
+        credentials_path (str): Path to the service account credentials file
+        
+    Returns:
+        googleapiclient.discovery.Resource: Google Sheets API client
+    """
+    from googleapiclient.discovery import build
+    from googleapiclient.model import JsonModel
+    from google.oauth2 import service_account
+    import orjson
+    
+    class OrjsonModel(JsonModel):
+        """
+        JSON model for googleapiclient that serializes request bodies with orjson
+        
+        The Sheets payload holds every cell of the table, so building the request
+        body is dominated by JSON encoding.
+        """
+        
+        def serialize(self, body_value):
+            if isinstance(body_value, dict) and "data" not in body_value and self._data_wrapper:
+                body_value = {"data": body_value}
+            return orjson.dumps(body_value).decode("utf-8")
+    
+    credentials = service_account.Credentials.from_service_account_file(
+        credentials_path, scopes=GOOGLE_SHEETS_SCOPES
+    )
+    return build("sheets", "v4", credentials=credentials, cache_discovery=False, model=OrjsonModel())
+
+def save_to_google_sheets(df, sheet_id, credentials_path=GOOGLE_CREDENTIALS_PATH):
+    """
+    Save DataFrame to Google Sheets, replacing the current worksheet contents
+    
+    The worksheet is resized and cleared in one batchUpdate request, then the
+    values are written as RAW rows with values.batchUpdate (one request per
+    chunk for very large frames). Unqualified A1 ranges address the first
+    worksheet, which is the one with GOOGLE_WORKSHEET_ID in a new spreadsheet.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame to save
+        sheet_id (str): ID of the Google Sheets spreadsheet
+        credentials_path (str): Path to the service account credentials file
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        service = get_sheets_service(credentials_path)
+        
+        # Send float32 values at their shortest decimal form and timestamps as text
+        datetime_columns = df.select_dtypes("datetime").columns
+        df = widen_float32_columns(df).astype({column: "str" for column in datetime_columns})
+        
+        # Build the cell values once, with missing values as empty cells
+        values = [df.columns.tolist()] + df.astype(object).where(df.notna(), "").values.tolist()
+        
+        # Fit the grid to the new data and clear the old values
+        requests = [
+            {
+                "updateSheetProperties": {
+                    "properties": {
+                        "sheetId": GOOGLE_WORKSHEET_ID,
+                        "gridProperties": {"rowCount": len(values), "columnCount": len(df.columns)},
+                    },
+                    "fields": "gridProperties(rowCount,columnCount)",
+                }
+            },
+            {"updateCells": {"range": {"sheetId": GOOGLE_WORKSHEET_ID}, "fields": "userEnteredValue"}},
+        ]
+        service.spreadsheets().batchUpdate(spreadsheetId=sheet_id, body={"requests": requests}).execute()
+        
+        for start in range(0, len(values), GOOGLE_SHEETS_CHUNK_ROWS):
+            data = [{"range": f"A{start + 1}", "values": values[start:start + GOOGLE_SHEETS_CHUNK_ROWS]}]
+            service.spreadsheets().values().batchUpdate(
+                spreadsheetId=sheet_id, body={"valueInputOption": "RAW", "data": data}
+            ).execute()
+        
+        print(f"Data successfully saved to Google Sheets {sheet_id}")
+        return True
+    
+    except Exception as e:
+        print(f"Error saving data to Google Sheets: {str(e)}")
+        return False
+
+def save_to_postgresql(df, connection_string):
+    """
+    Save DataFrame to PostgreSQL, replacing the current table
+    
+    Rows are streamed through a single COPY ... FROM STDIN instead of
+    one INSERT per row.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame to save
+        connection_string (str): SQLAlchemy connection string for PostgreSQL
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        # Imported here so runs without a PostgreSQL target never load SQLAlchemy
+        from sqlalchemy import create_engine
+        
+        engine = create_engine(connection_string)
+        columns = ", ".join(f'"{column}"' for column in POSTGRESQL_COLUMNS)
+        definitions = ", ".join(f'"{column}" {sql_type}' for column, sql_type in POSTGRESQL_COLUMNS.items())
+        
+        # Serialize the rows once into an in-memory CSV for COPY. The pyarrow writer
+        # keeps float32 columns at full precision, which pandas' to_csv does not
+        sink = pa.BufferOutputStream()
+        pacsv.write_csv(
+            pa.Table.from_pandas(df[list(POSTGRESQL_COLUMNS)], preserve_index=False),
+            sink,
+            write_options=pacsv.WriteOptions(batch_size=CSV_BATCH_SIZE, include_header=False)
+        )
+        buffer = io.BytesIO(sink.getvalue().to_pybytes())
+        
+        # Recreate the table with explicit column types and load it in one transaction,
+        # so a failed COPY leaves the previous table in place
+        try:
+            with engine.begin() as connection:
+                connection.exec_driver_sql(f"DROP TABLE IF EXISTS {POSTGRESQL_TABLE}")
+                connection.exec_driver_sql(f"CREATE TABLE {POSTGRESQL_TABLE} ({definitions})")
+                cursor = connection.connection.cursor()
+                try:
+                    cursor.copy_expert(f"COPY {POSTGRESQL_TABLE} ({columns}) FROM STDIN WITH CSV", buffer)
+                finally:
+                    cursor.close()
+        finally:
+            engine.dispose()
+        
+        print(f"Data successfully saved to PostgreSQL table {POSTGRESQL_TABLE}")
+        return True
+    
+    except Exception as e:
+        print(f"Error saving data to PostgreSQL: {str(e)}")
         return False
 
-def load_data(df, output_csv_path="products.csv", google_sheet_id=None, postgresql_conn_string=None):
+def load_data(df, output_csv_path="products.csv", google_sheet_id=None, postgresql_conn_string=None,
+              google_credentials_path=GOOGLE_CREDENTIALS_PATH, output_format="csv"):
     """
     Load transformed data to repositories
     
     Args:
         df (pandas.DataFrame): DataFrame to load
         output_csv_path (str): Path to save the CSV file
-        google_sheet_id (str, optional): Google Sheets ID (not implemented)
-        postgresql_conn_string (str, optional): PostgreSQL connection string (not implemented)
+        google_sheet_id (str, optional): Google Sheets ID
+        postgresql_conn_string (str, optional): PostgreSQL connection string
+        google_credentials_path (str): Path to the Google service account credentials file
+        output_format (str): Format of the output file, "csv" or "parquet"
         
     Returns:
         dict: Dictionary with status for each repository
@@ -43,14 +269,23 @@ def load_data(df, output_csv_path="products.csv", google_sheet_id=None, postgres
         print("Error: Cannot load empty DataFrame")
         return {"csv": False, "google_sheets": False, "postgresql": False}
     
-    results = {}
+    # Repositories that are not configured are reported as None (skipped)
+    results = {"csv": None, "google_sheets": None, "postgresql": None}
     
-    # Save to CSV
-    results["csv"] = save_to_csv(df, output_csv_path)
-    
-    # Report other repositories as None (skipped)
-    results["google_sheets"] = None
-    results["postgresql"] = None
+    # The repositories are independent and I/O-bound, so save to them concurrently
+    with ThreadPoolExecutor(max_workers=len(results)) as executor:
+        futures = {"csv": executor.submit(save_to_csv, df, output_csv_path, output_format)}
+        
+        if google_sheet_id:
+            futures["google_sheets"] = executor.submit(
+                save_to_google_sheets, df, google_sheet_id, google_credentials_path
+            )
+        
+        if postgresql_conn_string:
+            futures["postgresql"] = executor.submit(save_to_postgresql, df, postgresql_conn_string)
+        
+        for name, future in futures.items():
+            results[name] = future.result()
     
     return results
 
@@ -1,6 +1,53 @@
 import pandas as pd
-import numpy as np
-import re
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Patterns and prefixes used to clean the raw text columns. The patterns are RE2
+# patterns with one named group, as pyarrow.compute.extract_regex requires
+_PRICE_PATTERN = r'\$(?P<price>\d+(?:\.\d+)?)'
+_RATING_PATTERN = r'(?P<rating>\d+\.\d+)'
+_COLORS_PATTERN = r'(?P<colors>\d+)'
+_SIZE_PREFIX = 'Size: '
+_GENDER_PREFIX = 'Gender: '
+
+# Columns identifying a product, used to find duplicates
+PRODUCT_COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender']
+
+# Columns stored as categoricals in the transformed data
+CATEGORY_COLUMNS = ['Size', 'Gender']
+
+def extract_number(column, pattern):
+    """
+    Extract the number captured by a pattern from a text column
+    
+    The whole column goes through pyarrow.compute in one pass, without
+    creating a Python object per cell.
+    
+    Args:
+        column (pandas.Series): Raw text values
+        pattern (str): RE2 pattern with a single named group around the number
+        
+    Returns:
+        pandas.Series: Extracted numbers as float64, NaN where nothing matched
+    """
+    matches = pc.extract_regex(pa.array(column, type=pa.string()), pattern=pattern)
+    numbers = pc.cast(pc.struct_field(matches, [0]), pa.float64())
+    return pd.Series(numbers.to_numpy(zero_copy_only=False), index=column.index)
+
+def remove_prefix(column, prefix):
+    """
+    Remove a prefix from the values of a text column that start with it
+    
+    Args:
+        column (pandas.Series): Raw text values
+        prefix (str): Prefix to remove
+        
+    Returns:
+        pandas.Series: Values without the prefix, as Arrow-backed strings
+    """
+    values = pa.array(column, type=pa.string())
+    stripped = pc.if_else(pc.starts_with(values, prefix), pc.utf8_slice_codeunits(values, len(prefix)), values)
+    return pd.Series(stripped, index=column.index, dtype=pd.ArrowDtype(pa.string()))
 
 def transform_data(df):
     """
@@ -10,7 +57,7 @@ def transform_data(df):
     - Clean colors values to extract just the number
     - Clean size values to remove the "Size: " prefix
     - Clean gender values to remove the "Gender: " prefix
-    - Remove duplicates and null values
+    - Remove duplicate products (ignoring the scrape timestamp) and null values
     - Remove invalid products like "Unknown Product"
     
     Args:
@@ -20,115 +67,37 @@ def transform_data(df):
         pandas.DataFrame: Transformed data
     """
     try:
-        # Make a copy to avoid modifying the original DataFrame
-        transformed_df = df.copy()
-        
-        # Define invalid patterns
-        dirty_patterns = {
-            "Title": ["Unknown Product"],
-            "Rating": ["Invalid Rating / 5", "Not Rated"],
-            "Price": ["Price Unavailable", None]
-        }
-        
-        # Remove rows with any dirty patterns
-        for column, invalid_values in dirty_patterns.items():
-            transformed_df = transformed_df[~transformed_df[column].isin(invalid_values)]
-
-        # Drop nulls
-        transformed_df = transformed_df.dropna()
-        
-        # Transform Price column: convert USD to IDR
-        def convert_price_to_idr(price):
-            try:
-                if price and isinstance(price, str):
-                    # Extract the numerical value from the price string
-                    match = re.search(r'\$(\d+(?:\.\d+)?)', price)
-                    if match:
-                        # Convert to IDR with exchange rate of 16,000
-                        price_value = float(match.group(1))
-                        return price_value * 16000
-                    else:
-                        return np.nan
-                else:
-                    return np.nan
-            except Exception as e:
-                print(f"Error converting price '{price}': {str(e)}")
-                return np.nan
-                
-        transformed_df['Price'] = transformed_df['Price'].apply(convert_price_to_idr)
-        
-        # Transform Rating column: extract the numerical rating
-        def extract_rating(rating):
-            try:
-                if rating and isinstance(rating, str):
-                    # Extract the numerical value from the rating string
-                    match = re.search(r'(\d+\.\d+)', rating)
-                    if match:
-                        return float(match.group(1))
-                    else:
-                        return np.nan
-                else:
-                    return np.nan
-            except Exception as e:
-                print(f"Error extracting rating '{rating}': {str(e)}")
-                return np.nan
-                
-        transformed_df['Rating'] = transformed_df['Rating'].apply(extract_rating)
-        
-        # Transform Colors column: extract just the number
-        def extract_colors(colors):
-            try:
-                if colors and isinstance(colors, str):
-                    # Extract the numerical value from the colors string
-                    match = re.search(r'(\d+)', colors)
-                    if match:
-                        return int(match.group(1))
-                    else:
-                        return np.nan
-                else:
-                    return np.nan
-            except Exception as e:
-                print(f"Error extracting colors '{colors}': {str(e)}")
-                return np.nan
-                
-        transformed_df['Colors'] = transformed_df['Colors'].apply(extract_colors)
-        
-        # Transform Size column: remove the "Size: " prefix
-        def clean_size(size):
-            try:
-                if size and isinstance(size, str):
-                    return size.replace('Size: ', '')
-                else:
-                    return np.nan
-            except Exception as e:
-                print(f"Error cleaning size '{size}': {str(e)}")
-                return np.nan
-                
-        transformed_df['Size'] = transformed_df['Size'].apply(clean_size)
-        
-        # Transform Gender column: remove the "Gender: " prefix
-        def clean_gender(gender):
-            try:
-                if gender and isinstance(gender, str):
-                    return gender.replace('Gender: ', '')
-                else:
-                    return np.nan
-            except Exception as e:
-                print(f"Error cleaning gender '{gender}': {str(e)}")
-                return np.nan
-                
-        transformed_df['Gender'] = transformed_df['Gender'].apply(clean_gender)
-        
-        # Drop any rows with NaN values after transformation
-        transformed_df = transformed_df.dropna()
+        # Each column is cleaned straight into a new frame, so the raw data is never
+        # copied as a whole. Columns are cast to their final type as they are cleaned,
+        # using the smallest type that fits: prices stay well within float32 precision,
+        # ratings are 0-5 and color counts are small
+        transformed_df = pd.DataFrame({
+            'Title': df['Title'],
+            
+            # Convert the price from USD to IDR (exchange rate 16,000)
+            'Price': (extract_number(df['Price'], _PRICE_PATTERN) * 16000).astype('float32'),
+            
+            # Extract the numerical rating
+            'Rating': extract_number(df['Rating'], _RATING_PATTERN).astype('float32'),
+            
+            # Extract just the number of colors (nullable until invalid rows are gone)
+            'Colors': extract_number(df['Colors'], _COLORS_PATTERN).astype('Int16'),
+            
+            # Remove the prefixes. Size and gender only take a handful of distinct
+            # values, so they are stored as categoricals
+            'Size': remove_prefix(df['Size'], _SIZE_PREFIX).astype('category'),
+            'Gender': remove_prefix(df['Gender'], _GENDER_PREFIX).astype('category'),
+            
+            'timestamp': pd.to_datetime(df['timestamp']).astype('datetime64[s]'),
+        })
         
-        # Drop duplicates
-        transformed_df = transformed_df.drop_duplicates()
+        # Remove invalid rows in a single pass. Dirty values such as "Price Unavailable"
+        # or "Invalid Rating / 5" have already become NaN during cleaning
+        valid_mask = (transformed_df['Title'] != 'Unknown Product') & transformed_df.notna().all(axis=1)
         
-        # Ensure data types are correctly set
-        transformed_df['Rating'] = transformed_df['Rating'].astype(float)
-        transformed_df['Colors'] = transformed_df['Colors'].astype(int)
-        transformed_df['Price'] = transformed_df['Price'].astype(float)
+        # Drop duplicate products, whenever they were scraped
+        transformed_df = transformed_df.loc[valid_mask].drop_duplicates(subset=PRODUCT_COLUMNS, ignore_index=True)
+        transformed_df['Colors'] = transformed_df['Colors'].astype('int16')
         
         return transformed_df
         
@@ -136,11 +105,32 @@ def transform_data(df):
         print(f"Error in transform_data: {str(e)}")
         return None
 
+def combine_chunks(chunks):
+    """
+    Combine separately transformed chunks into a single DataFrame
+    
+    Args:
+        chunks (list): Non-empty list of DataFrames returned by transform_data
+        
+    Returns:
+        pandas.DataFrame: Combined data without duplicates across chunks
+    """
+    non_empty_chunks = [chunk for chunk in chunks if not chunk.empty] or chunks[:1]
+    combined_df = pd.concat(non_empty_chunks, ignore_index=True)
+    
+    # Chunks can have different category sets, which concat widens to object
+    for column in CATEGORY_COLUMNS:
+        combined_df[column] = combined_df[column].astype('category')
+    
+    return combined_df.drop_duplicates(subset=PRODUCT_COLUMNS, ignore_index=True)
+
 if __name__ == "__main__":
     # Test the transformation function
     try:
         # Load the raw data
-        raw_df = pd.read_csv("raw_products.csv")
+        # Read with the Arrow engine into Arrow-backed columns, so the string cleaning
+        # runs over Arrow string arrays instead of boxed Python objects
+        raw_df = pd.read_csv("raw_products.csv", engine="pyarrow", dtype_backend="pyarrow")
         
         # Transform the data
         transformed_df = transform_data(raw_df)